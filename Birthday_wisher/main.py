@@ -2,11 +2,11 @@ from datetime import datetime
 from pathlib import Path
 import pandas as pd
 import random
-import smtplib
-from email.message import EmailMessage
+from messaging import MessagingGateway, SmtpEmailBackend
 
 MY_EMAIL = "YOUR EMAIL"
 MY_PASSWORD = "YOUR PASSWORD"
+SMTP_ADDRESS = "YOUR EMAIL PROVIDER SMTP SERVER ADDRESS"
 
 def get_today_tuple():
     now = datetime.now()
@@ -21,17 +21,13 @@ def generate_letter(name):
     content = template.read_text()
     return content.replace("[NAME]", name)
 
-def send_email(recipient, content):
-    msg = EmailMessage()
-    msg["Subject"] = "Happy Birthday!"
-    msg["From"] = MY_EMAIL
-    msg["To"] = recipient
-    msg.set_content(content)
+def create_gateway():
+    gateway = MessagingGateway()
+    gateway.register("email", SmtpEmailBackend(SMTP_ADDRESS, MY_EMAIL, MY_PASSWORD))
+    return gateway
 
-    with smtplib.SMTP("YOUR EMAIL PROVIDER SMTP SERVER ADDRESS") as smtp:
-        smtp.starttls()
-        smtp.login(MY_EMAIL, MY_PASSWORD)
-        smtp.send_message(msg)
+def send_email(gateway, recipient, content):
+    return gateway.send("email", to=recipient, body=content, subject="Happy Birthday!")
 
 def main():
     today = get_today_tuple()
@@ -39,7 +35,8 @@ def main():
     if today in birthdays:
         person = birthdays[today]
         letter = generate_letter(person["name"])
-        send_email(person["email"], letter)
+        with create_gateway() as gateway:
+            send_email(gateway, person["email"], letter).result()
 
 if __name__ == "__main__":
     main()
@@ -2,6 +2,7 @@ import os
 import requests
 from requests.auth import HTTPBasicAuth
 from dotenv import load_dotenv
+from http_cassette import get_session
 
 # Load environment variables
 load_dotenv()
@@ -26,6 +27,9 @@ class DataManager:
         # Set up authentication
         self._auth = HTTPBasicAuth(username, password)
         
+        # Shared session so runs can be recorded and replayed
+        self._session = get_session()
+        
         # Initialize data containers
         self.destination_data = []
         self.customer_data = []
@@ -38,7 +42,7 @@ class DataManager:
             list: List of destination dictionaries
         """
         try:
-            response = requests.get(url=self.prices_endpoint, auth=self._auth)
+            response = self._session.get(url=self.prices_endpoint, auth=self._auth)
             response.raise_for_status()
             
             data = response.json()
@@ -68,7 +72,7 @@ class DataManager:
             
             try:
                 # Send update request
-                response = requests.put(
+                response = self._session.put(
                     url=f"{self.prices_endpoint}/{destination['id']}",
                     json=update_data,
                     auth=self._auth
@@ -89,7 +93,7 @@ class DataManager:
             list: List of customer data dictionaries
         """
         try:
-            response = requests.get(url=self.users_endpoint, auth=self._auth)
+            response = self._session.get(url=self.users_endpoint, auth=self._auth)
             response.raise_for_status()
             
             data = response.json()
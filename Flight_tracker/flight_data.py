@@ -1,3 +1,10 @@
+import json
+
+try:
+    import ijson
+except ImportError:  # Streaming is optional; fall back to parsing the whole response
+    ijson = None
+
 class FlightData:
     """Stores information about a flight including price and route details"""
     
@@ -85,7 +92,18 @@ def find_cheapest_flight(data):
         print("No valid flight data available")
         return create_empty_flight()
     
-    flights = data['data']
+    return select_cheapest_flight(data['data'])
+
+def select_cheapest_flight(flights):
+    """
+    Keep a running cheapest flight over an iterable of flight offers
+    
+    Args:
+        flights: Iterable of flight offers (full or trimmed to the fields extract_flight_details reads)
+        
+    Returns:
+        FlightData: Object containing details of the cheapest flight
+    """
     cheapest_price = float('inf')
     cheapest_flight_details = None
     
@@ -108,4 +126,83 @@ def find_cheapest_flight(data):
         return FlightData(*cheapest_flight_details)
     
     # Otherwise return empty flight data
-    return create_empty_flight()
\ No newline at end of file
+    return create_empty_flight()
+
+# Parser events that carry the fields extract_flight_details needs
+_OFFER = "data.item"
+_PRICE = "data.item.price.grandTotal"
+_ITINERARY = "data.item.itineraries.item"
+_SEGMENT = "data.item.itineraries.item.segments.item"
+_SEGMENT_FIELDS = {
+    f"{_SEGMENT}.departure.iataCode": ("departure", "iataCode"),
+    f"{_SEGMENT}.departure.at": ("departure", "at"),
+    f"{_SEGMENT}.arrival.iataCode": ("arrival", "iataCode"),
+}
+
+def iter_flight_offers(stream):
+    """
+    Incrementally parse a flight offers response into trimmed offers
+    
+    Only the price, segment endpoints and departure times are kept, so memory
+    stays flat no matter how many offers or dictionaries the response holds.
+    
+    Args:
+        stream: Binary file-like object with the flight offers JSON
+        
+    Yields:
+        dict: Offer with the same shape extract_flight_details expects
+    """
+    offer = None
+    for prefix, event, value in ijson.parse(stream):
+        if event == "start_map":
+            if prefix == _OFFER:
+                offer = {"price": {}, "itineraries": []}
+            elif prefix == _ITINERARY:
+                offer["itineraries"].append({"segments": []})
+            elif prefix == _SEGMENT:
+                offer["itineraries"][-1]["segments"].append({"departure": {}, "arrival": {}})
+        elif event == "end_map" and prefix == _OFFER:
+            yield offer
+            offer = None
+        elif prefix == _PRICE:
+            offer["price"]["grandTotal"] = value
+        elif prefix in _SEGMENT_FIELDS:
+            endpoint, field = _SEGMENT_FIELDS[prefix]
+            offer["itineraries"][-1]["segments"][-1][endpoint][field] = value
+
+def find_cheapest_flight_stream(stream):
+    """
+    Find the cheapest flight while streaming the API response body
+    
+    Falls back to loading the whole response when ijson is not installed.
+    
+    Args:
+        stream: Binary file-like object with the flight offers JSON
+        
+    Returns:
+        FlightData: Object containing details of the cheapest flight
+    """
+    if ijson is None:
+        try:
+            return find_cheapest_flight(json.load(stream))
+        except ValueError as e:
+            print(f"Error parsing flight data: {e}")
+            return create_empty_flight()
+    
+    found = False
+    
+    def offers():
+        nonlocal found
+        for offer in iter_flight_offers(stream):
+            found = True
+            yield offer
+    
+    try:
+        cheapest_flight = select_cheapest_flight(offers())
+    except ijson.JSONError as e:
+        print(f"Error parsing flight data: {e}")
+        return create_empty_flight()
+    
+    if not found:
+        print("No valid flight data available")
+    return cheapest_flight
\ No newline at end of file
@@ -2,10 +2,39 @@ import requests
 from datetime import datetime
 import os
 from dotenv import load_dotenv
+from http_cassette import get_session
+from flight_data import create_empty_flight, find_cheapest_flight_stream
 
 # Load environment variables from .env file
 load_dotenv()
 
+class _ResponseReader:
+    """
+    File-like view of a streamed response for incremental parsers
+    
+    Reads go through iter_content, so the body is decoded and dropped connections
+    surface as requests exceptions instead of raw urllib3 errors.
+    """
+    
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, response):
+        self._chunks = response.iter_content(self.CHUNK_SIZE)
+        self._buffer = b""
+    
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
 class FlightSearch:
     """Handles flight search operations using the Amadeus API"""
     
@@ -14,6 +43,9 @@ class FlightSearch:
     FLIGHT_ENDPOINT = "https://test.api.amadeus.com/v2/shopping/flight-offers"
     TOKEN_ENDPOINT = "https://test.api.amadeus.com/v1/security/oauth2/token"
     
+    # Number of offers requested per search
+    MAX_OFFERS = "10"
+    
     def __init__(self):
         """Initialize flight search with API credentials and authentication token"""
         self._api_key = os.environ.get("AMADEUS_API_KEY")
@@ -23,6 +55,8 @@ class FlightSearch:
         if not self._api_key or not self._api_secret:
             raise ValueError("Missing Amadeus API credentials in environment variables")
             
+        # Shared session so runs can be recorded and replayed
+        self._session = get_session()
         self._token = self._authenticate()
         
     def _authenticate(self):
@@ -36,7 +70,7 @@ class FlightSearch:
         }
         
         try:
-            response = requests.post(
+            response = self._session.post(
                 url=self.TOKEN_ENDPOINT, 
                 headers=headers, 
                 data=auth_data
@@ -75,7 +109,7 @@ class FlightSearch:
         }
         
         try:
-            response = requests.get(
+            response = self._session.get(
                 url=self.IATA_ENDPOINT,
                 headers=headers,
                 params=params
@@ -115,6 +149,46 @@ class FlightSearch:
         Returns:
             dict or None: Flight offer data or None if request failed
         """
+        response = self._request_flight_offers(
+            origin_city_code, destination_city_code, from_time, to_time, is_direct
+        )
+        if response is None:
+            return None
+        return response.json()
+
+    def find_cheapest_flight(self, origin_city_code, destination_city_code, from_time, to_time, is_direct=True):
+        """
+        Search for flights and stream the response to find the cheapest one
+        
+        Unlike check_flights, the offers are parsed incrementally and never held
+        in memory as a whole, so large searches use a flat amount of memory.
+        
+        Args:
+            origin_city_code: IATA code of departure city
+            destination_city_code: IATA code of destination city
+            from_time: Departure date as datetime object
+            to_time: Return date as datetime object
+            is_direct: Whether to search for direct flights only
+            
+        Returns:
+            FlightData: Cheapest flight, or placeholder values if none was found
+        """
+        response = self._request_flight_offers(
+            origin_city_code, destination_city_code, from_time, to_time, is_direct, stream=True
+        )
+        if response is None:
+            return create_empty_flight()
+        
+        with response:
+            try:
+                return find_cheapest_flight_stream(_ResponseReader(response))
+            except requests.exceptions.RequestException as e:
+                print(f"Request error during flight search: {e}")
+                return create_empty_flight()
+
+    def _request_flight_offers(self, origin_city_code, destination_city_code, from_time, to_time,
+                               is_direct=True, stream=False):
+        """Send a flight offers search and return the response, or None if it failed"""
         if not all([origin_city_code, destination_city_code, from_time, to_time]):
             print("Missing required parameters for flight search")
             return None
@@ -133,20 +207,24 @@ class FlightSearch:
             "adults": 1,
             "nonStop": "true" if is_direct else "false",
             "currencyCode": "GBP",
-            "max": "10",
+            "max": self.MAX_OFFERS,
         }
 
         try:
-            response = requests.get(
+            response = self._session.get(
                 url=self.FLIGHT_ENDPOINT,
                 headers=headers,
                 params=params,
+                stream=stream,
             )
             response.raise_for_status()
-            return response.json()
+            return response
             
         except requests.exceptions.HTTPError as e:
             status_code = e.response.status_code if hasattr(e, 'response') else "unknown"
+            # A streamed error response keeps its pooled connection until closed
+            if e.response is not None:
+                e.response.close()
             print(f"Flight search failed with status code: {status_code}")
             print(f"Error details: {e}")
             print("For more information, see: "
@@ -0,0 +1,214 @@
+import atexit
+import gzip
+import hashlib
+import io
+import json
+import os
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# FLIGHT_TRACKER_HTTP_MODE: "record", "replay" or unset for live traffic
+MODE_VARIABLE = "FLIGHT_TRACKER_HTTP_MODE"
+CASSETTE_VARIABLE = "FLIGHT_TRACKER_CASSETTE"
+# Replay speed multiplier: 1 reproduces recorded latency, 0 (default) replays instantly
+SPEED_VARIABLE = "FLIGHT_TRACKER_REPLAY_SPEED"
+DEFAULT_CASSETTE = Path(__file__).with_name("cassette.json.gz")
+
+# Headers that no longer describe the stored (already decoded) body
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+# JSON response fields never written to a cassette
+SECRET_FIELDS = {"access_token", "refresh_token", "id_token", "client_secret"}
+REDACTED = "REDACTED"
+
+_session = None
+
+
+def _request_key(request):
+    """Match requests on method, full URL and a hash of the body (which may contain secrets)"""
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return f"{request.method} {request.url} {hashlib.sha256(body).hexdigest()}"
+
+
+def _loose_key(key):
+    """Method and URL only, for replaying with different credentials in the request body"""
+    return key.rsplit(" ", 1)[0]
+
+
+def _redact(value):
+    """Replace secrets and email addresses in a parsed JSON body"""
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    redacted = {}
+    for name, item in value.items():
+        if name.lower() in SECRET_FIELDS:
+            item = REDACTED
+        elif "email" in name.lower() and isinstance(item, str):
+            # Stable placeholder so replays still see the same number of distinct customers
+            item = f"{hashlib.sha256(item.encode('utf-8')).hexdigest()[:12]}@example.invalid"
+        else:
+            item = _redact(item)
+        redacted[name] = item
+    return redacted
+
+
+def _recorded_body(content):
+    """Cassette body for a response: redacted JSON, other text, or hex for binary content"""
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        return {"hex": content.hex()}
+    try:
+        return {"text": json.dumps(_redact(json.loads(text)))}
+    except ValueError:
+        return {"text": text}
+
+
+class RecordingSession(requests.Session):
+    """
+    Session that performs live requests and records every interaction to a cassette
+
+    JSON response bodies are stored with tokens and email addresses redacted;
+    non-JSON bodies are stored as received.
+    """
+
+    def __init__(self, cassette_path):
+        super().__init__()
+        self.cassette_path = Path(cassette_path)
+        self.recorded_at = datetime.now()
+        self.interactions = []
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        content = response.content
+        elapsed = time.perf_counter() - started
+
+        body = _recorded_body(content)
+
+        self.interactions.append({
+            "key": _request_key(request),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in _DROPPED_HEADERS
+            },
+            "body": body,
+            "elapsed": elapsed,
+        })
+        # Let streaming callers read the body again
+        response.raw = io.BytesIO(content)
+        return response
+
+    def save(self):
+        """Write all recorded interactions to the compressed cassette file"""
+        with gzip.open(self.cassette_path, "wt", encoding="utf-8") as cassette:
+            json.dump({"recorded_at": self.recorded_at.isoformat(), "interactions": self.interactions}, cassette)
+        print(f"Recorded {len(self.interactions)} HTTP interaction(s) to {self.cassette_path}")
+
+
+class ReplaySession(requests.Session):
+    """Session that serves responses from a cassette without touching the network"""
+
+    def __init__(self, cassette_path, speed=0.0):
+        """
+        Load a cassette for replay
+
+        Args:
+            cassette_path: Cassette written by RecordingSession
+            speed: Latency multiplier; 1 reproduces recorded timings, 0 replays instantly
+        """
+        super().__init__()
+        self.speed = speed
+        self._responses = defaultdict(deque)
+        self._loose_responses = defaultdict(deque)
+        with gzip.open(cassette_path, "rt", encoding="utf-8") as cassette:
+            data = json.load(cassette)
+        self.recorded_at = datetime.fromisoformat(data["recorded_at"])
+        for interaction in data["interactions"]:
+            self._responses[interaction["key"]].append(interaction)
+            self._loose_responses[_loose_key(interaction["key"])].append(interaction)
+
+    def send(self, request, **kwargs):
+        key = _request_key(request)
+        recorded = self._responses.get(key) or self._loose_responses.get(_loose_key(key))
+        if not recorded:
+            raise requests.exceptions.ConnectionError(
+                f"No recorded response for {request.method} {request.url}", request=request
+            )
+        # Repeated identical requests replay in recorded order; the last one is reused
+        interaction = recorded.popleft() if len(recorded) > 1 else recorded[0]
+
+        if self.speed:
+            time.sleep(interaction["elapsed"] * self.speed)
+
+        body = interaction["body"]
+        content = body["text"].encode("utf-8") if "text" in body else bytes.fromhex(body["hex"])
+
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction["reason"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=interaction["elapsed"])
+        response.raw = io.BytesIO(content)
+        if not kwargs.get("stream"):
+            response._content = content
+        return response
+
+
+def http_mode():
+    """The configured HTTP mode: "record", "replay" or "live" """
+    return os.environ.get(MODE_VARIABLE, "live").lower()
+
+
+def get_session():
+    """
+    Return the shared HTTP session used by FlightSearch and DataManager
+
+    The session records, replays or goes live depending on FLIGHT_TRACKER_HTTP_MODE.
+    """
+    global _session
+    if _session is None:
+        mode = http_mode()
+        cassette_path = os.environ.get(CASSETTE_VARIABLE, DEFAULT_CASSETTE)
+        if mode == "record":
+            _session = RecordingSession(cassette_path)
+            atexit.register(_session.save)
+        elif mode == "replay":
+            _session = ReplaySession(cassette_path, float(os.environ.get(SPEED_VARIABLE, "0")))
+        elif mode == "live":
+            _session = requests.Session()
+        else:
+            raise ValueError(f"Unknown {MODE_VARIABLE}: {mode}")
+    return _session
+
+
+def current_time():
+    """
+    The time the run should treat as "now"
+
+    Replays use the recording time so date-based search parameters match the cassette.
+    """
+    if http_mode() == "replay":
+        return get_session().recorded_at
+    return datetime.now()
+
+
+def rate_limit_pause(seconds):
+    """Sleep between API calls, except when replaying where there is no rate limit"""
+    if http_mode() != "replay":
+        time.sleep(seconds)
@@ -1,10 +1,10 @@
-import time
-from datetime import datetime, timedelta
+from datetime import timedelta
 import logging
 from data_manager import DataManager
 from flight_search import FlightSearch
-from flight_data import find_cheapest_flight
 from notification_manager import NotificationManager
+from http_cassette import current_time, http_mode, rate_limit_pause
+from profiling import run_profiled
 
 # Set up logging
 logging.basicConfig(
@@ -42,7 +42,7 @@ def update_destination_codes(data_manager, flight_search, destinations):
             
             # Get code and add delay to avoid rate limiting
             destination["iataCode"] = flight_search.get_destination_code(city)
-            time.sleep(1)
+            rate_limit_pause(1)
             updated = True
     
     # Update codes in database if changes were made
@@ -69,26 +69,23 @@ def search_for_flights(flight_search, destinations, origin_code, search_period):
         
         # Search for direct flights first
         logger.info(f"Searching direct flights to {city}...")
-        flights = flight_search.check_flights(
+        cheapest_flight = flight_search.find_cheapest_flight(
             origin_code,
             destination_code,
             from_time=tomorrow,
             to_time=six_months_later
         )
         
-        cheapest_flight = find_cheapest_flight(flights)
-        
         # If no direct flights, try with connections
         if cheapest_flight.price == "N/A":
             logger.info(f"No direct flights to {city}, trying with connections...")
-            indirect_flights = flight_search.check_flights(
+            cheapest_flight = flight_search.find_cheapest_flight(
                 origin_code,
                 destination_code,
                 from_time=tomorrow,
                 to_time=six_months_later,
                 is_direct=False
             )
-            cheapest_flight = find_cheapest_flight(indirect_flights)
         
         # Add to results
         results.append({
@@ -97,7 +94,7 @@ def search_for_flights(flight_search, destinations, origin_code, search_period):
         })
         
         # Avoid rate limiting
-        time.sleep(1)
+        rate_limit_pause(1)
     
     return results
 
@@ -145,21 +142,23 @@ def format_deal_message(deal):
     
     return message
 
+def deal_key(deal):
+    """Identify a deal by route, price and dates for idempotent notifications"""
+    flight = deal["flight"]
+    return (f"{flight.origin_airport}-{flight.destination_airport}:"
+            f"{flight.price}:{flight.out_date}:{flight.return_date}")
+
 def send_notifications(notification_manager, deals, email_list):
-    """Send notifications for all flight deals"""
-    logger.info(f"Sending notifications for {len(deals)} deals...")
+    """Queue notifications for all flight deals in the outbox"""
+    logger.info(f"Queueing notifications for {len(deals)} deals...")
     
     for deal in deals:
         message = format_deal_message(deal)
         city = deal["destination"].get("city", "your destination")
         
-        # Send WhatsApp notification
-        notification_manager.send_whatsapp(message_body=message)
-        
-        # Send email notifications
-        if email_list:
-            notification_manager.send_emails(email_list=email_list, email_body=message)
-            logger.info(f"Notifications sent for {city} deal")
+        # WhatsApp and email notifications are delivered by the outbox drainer
+        queued = notification_manager.queue_deal_notifications(deal_key(deal), message, email_list)
+        logger.info(f"Queued {queued} new notification(s) for {city} deal")
 
 def main():
     """Main flight finder program"""
@@ -167,10 +166,20 @@ def main():
         # Initialize services
         data_manager, flight_search, notification_manager = setup_services()
         
+        # Replayed runs are for profiling and must not message real customers
+        replaying = http_mode() == "replay"
+        
+        # Deliver what an interrupted run left in the outbox before searching again
+        if not replaying:
+            resumed = notification_manager.resume_interrupted_notifications()
+            if resumed:
+                logger.info(f"Resumed {resumed} undelivered notification(s) from the outbox")
+        
         # Set search parameters
         ORIGIN_CITY_IATA = "LON"
-        tomorrow = datetime.now() + timedelta(days=1)
-        six_months_from_today = datetime.now() + timedelta(days=(6 * 30))
+        now = current_time()
+        tomorrow = now + timedelta(days=1)
+        six_months_from_today = now + timedelta(days=(6 * 30))
         search_period = (tomorrow, six_months_from_today)
         
         # Get destination data
@@ -191,15 +200,20 @@ def main():
         # Check for deals
         deals = check_for_deals(flight_results)
         
-        if deals:
+        if deals and replaying:
+            logger.info(f"Found {len(deals)} flight deals (replay mode, notifications skipped)")
+        elif deals:
             logger.info(f"Found {len(deals)} flight deals!")
             send_notifications(notification_manager, deals, email_list)
         else:
             logger.info("No flight deals found today")
+        
+        if not replaying:
+            notification_manager.close()
             
     except Exception as e:
         logger.error(f"Program error: {e}")
         raise
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled(main)
\ No newline at end of file
@@ -1,7 +1,9 @@
 import os
-import smtplib
+from pathlib import Path
 from twilio.rest import Client
 from dotenv import load_dotenv
+from messaging import (MessagingGateway, Outbox, RateLimiter, SmtpEmailBackend,
+                       TwilioSmsBackend, TwilioWhatsAppBackend, make_key)
 
 # Load environment variables
 load_dotenv()
@@ -9,6 +11,16 @@ load_dotenv()
 class NotificationManager:
     """Manages sending notifications via different channels (email, SMS, WhatsApp)"""
     
+    # Throughput settings for the shared messaging gateway
+    EMAIL_CONCURRENCY = 2
+    TWILIO_MESSAGES_PER_SECOND = 1
+    EMAIL_SUBJECT = "New Low Price Flight!"
+    
+    # Durable record of queued notifications, shared across runs
+    OUTBOX_PATH = Path(__file__).with_name("outbox.db")
+    # Deal prices go stale, so undelivered notifications are dropped after a day
+    NOTIFICATION_TTL = 24 * 60 * 60
+    
     def __init__(self):
         """Initialize notification channels with credentials from environment variables"""
         # Email configuration
@@ -28,6 +40,35 @@ class NotificationManager:
         
         # Set up Twilio client
         self.client = Client(self.twilio_sid, self.twilio_token)
+        
+        # Route every channel through the shared messaging gateway
+        self.gateway = self._create_gateway()
+        
+        # Deal notifications are stored before sending so restarts can resume them
+        self.outbox = Outbox(self.OUTBOX_PATH, self.gateway, ttl=self.NOTIFICATION_TTL)
+    
+    def _create_gateway(self):
+        """Register email, SMS and WhatsApp backends with a messaging gateway"""
+        gateway = MessagingGateway()
+        gateway.register(
+            "email",
+            SmtpEmailBackend(self.smtp_address, self.email, self.email_password),
+            concurrency=self.EMAIL_CONCURRENCY
+        )
+        
+        # SMS and WhatsApp go through the same Twilio account, so they share one rate limit
+        twilio_limit = RateLimiter(self.TWILIO_MESSAGES_PER_SECOND)
+        gateway.register(
+            "sms",
+            TwilioSmsBackend(self.twilio_sid, self.twilio_token, self.twilio_virtual_number, client=self.client),
+            rate_limiter=twilio_limit
+        )
+        gateway.register(
+            "whatsapp",
+            TwilioWhatsAppBackend(self.twilio_sid, self.twilio_token, self.whatsapp_number, client=self.client),
+            rate_limiter=twilio_limit
+        )
+        return gateway
     
     def _validate_config(self):
         """Validate that all required configuration variables are present"""
@@ -54,11 +95,7 @@ class NotificationManager:
             message_body: Text message to send
         """
         try:
-            message = self.client.messages.create(
-                from_=self.twilio_virtual_number,
-                body=message_body,
-                to=self.twilio_verified_number
-            )
+            message = self.gateway.send("sms", to=self.twilio_verified_number, body=message_body).result()
             print(f"SMS sent successfully (SID: {message.sid})")
             return True
         except Exception as e:
@@ -73,11 +110,7 @@ class NotificationManager:
             message_body: Text message to send
         """
         try:
-            message = self.client.messages.create(
-                from_=f'whatsapp:{self.whatsapp_number}',
-                body=message_body,
-                to=f'whatsapp:{self.twilio_verified_number}'
-            )
+            message = self.gateway.send("whatsapp", to=self.twilio_verified_number, body=message_body).result()
             print(f"WhatsApp message sent successfully (SID: {message.sid})")
             return True
         except Exception as e:
@@ -97,29 +130,74 @@ class NotificationManager:
             print("No recipients provided for email notification")
             return
         
-        try:
-            # Create SMTP connection
-            with smtplib.SMTP(self.smtp_address) as connection:
-                connection.starttls()
-                connection.login(self.email, self.email_password)
-                
-                # Format email message
-                message = f"Subject:New Low Price Flight!\n\n{email_body}".encode('utf-8')
-                
-                # Send to each recipient
-                successful = 0
-                for email in email_list:
-                    try:
-                        connection.sendmail(
-                            from_addr=self.email,
-                            to_addrs=email,
-                            msg=message
-                        )
-                        successful += 1
-                    except Exception as e:
-                        print(f"Failed to send email to {email}: {e}")
-                
-                print(f"Successfully sent {successful} out of {len(email_list)} emails")
-                
-        except Exception as e:
-            print(f"Email service error: {e}")
\ No newline at end of file
+        # Queue every recipient at once; the gateway reuses connections and retries failures
+        pending = [
+            (email, self.gateway.send("email", to=email, body=email_body, subject=self.EMAIL_SUBJECT))
+            for email in email_list
+        ]
+        
+        successful = 0
+        for email, future in pending:
+            try:
+                future.result()
+                successful += 1
+            except Exception as e:
+                print(f"Failed to send email to {email}: {e}")
+        
+        print(f"Successfully sent {successful} out of {len(email_list)} emails")
+    
+    def queue_deal_notifications(self, deal_key, message_body, email_list):
+        """
+        Store WhatsApp and email notifications for a deal in the outbox
+        
+        Messages already queued for the same deal and recipient are skipped,
+        so re-running after a failure never sends a deal twice.
+        
+        Args:
+            deal_key: Value identifying the deal (route, price and dates)
+            message_body: Text message to send
+            email_list: List of recipient email addresses
+            
+        Returns:
+            int: Number of newly queued messages
+        """
+        # Deliver in the background while the remaining deals are queued
+        self.outbox.start()
+        
+        queued = int(self.outbox.enqueue(
+            "whatsapp",
+            to=self.twilio_verified_number,
+            body=message_body,
+            key=make_key(deal_key, "whatsapp", self.twilio_verified_number)
+        ))
+        
+        for email in email_list or []:
+            queued += self.outbox.enqueue(
+                "email",
+                to=email,
+                body=message_body,
+                subject=self.EMAIL_SUBJECT,
+                key=make_key(deal_key, "email", email)
+            )
+        
+        return queued
+    
+    def resume_interrupted_notifications(self):
+        """
+        Deliver notifications an interrupted earlier run left in the outbox
+        
+        Returns:
+            int: Number of notifications that were resumed
+        """
+        resumed, sent, failed, retrying = self.outbox.resume_interrupted()
+        if resumed:
+            print(f"Resumed {resumed} notification(s): {sent} sent, {failed} failed, {retrying} still pending")
+        return resumed
+    
+    def close(self):
+        """Deliver any queued messages and release gateway connections"""
+        sent, failed, retrying = self.outbox.stop()
+        print(f"Outbox final pass: {sent} sent, {failed} failed, {retrying} still pending")
+        self.gateway.flush()
+        print(f"Delivery metrics: {self.gateway.metrics()}")
+        self.gateway.close()
@@ -0,0 +1,54 @@
+import cProfile
+import os
+import pstats
+from pathlib import Path
+
+# FLIGHT_TRACKER_PROFILE: "cprofile", "sampling" or unset to run without a profiler
+PROFILE_VARIABLE = "FLIGHT_TRACKER_PROFILE"
+OUTPUT_VARIABLE = "FLIGHT_TRACKER_PROFILE_OUTPUT"
+DEFAULT_CPROFILE_OUTPUT = Path(__file__).with_name("flight_tracker.prof")
+DEFAULT_SAMPLING_OUTPUT = Path(__file__).with_name("flight_tracker.html")
+
+
+def run_profiled(func):
+    """
+    Run `func` under the profiler selected by FLIGHT_TRACKER_PROFILE
+
+    cProfile stats are written to FLIGHT_TRACKER_PROFILE_OUTPUT (default
+    flight_tracker.prof next to this module) and the top functions are printed.
+    Sampling uses pyinstrument, which must be installed separately, and writes
+    an HTML report (default flight_tracker.html next to this module).
+    """
+    mode = os.environ.get(PROFILE_VARIABLE, "").lower()
+    if not mode:
+        return func()
+
+    if mode == "cprofile":
+        output = os.environ.get(OUTPUT_VARIABLE, DEFAULT_CPROFILE_OUTPUT)
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func)
+        finally:
+            profiler.dump_stats(output)
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+            print(f"cProfile stats written to {output}")
+
+    if mode == "sampling":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise RuntimeError("Sampling profiles require pyinstrument (pip install pyinstrument)")
+
+        output = os.environ.get(OUTPUT_VARIABLE, DEFAULT_SAMPLING_OUTPUT)
+        profiler = Profiler()
+        profiler.start()
+        try:
+            return func()
+        finally:
+            profiler.stop()
+            with open(output, "w", encoding="utf-8") as report:
+                report.write(profiler.output_html())
+            print(profiler.output_text())
+            print(f"Sampling profile written to {output}")
+
+    raise ValueError(f"Unknown {PROFILE_VARIABLE}: {mode}")
@@ -1,15 +1,20 @@
 from tkinter import *
-import requests
+from quote_provider import QuoteProvider
 
 
-def get_quote():
-    response = requests.get("https://api.kanye.rest")
-    response.raise_for_status()
-    data = response.json()
-    quote = data["quote"]
+def show_quote(quote):
     canvas.itemconfig(quote_text, text=quote)
 
 
+def get_quote():
+    quote_provider.next_quote(show_quote)
+
+
+def close_window():
+    quote_provider.stop()
+    window.destroy()
+
+
 window = Tk()
 window.title("Kanye Says...")
 window.config(padx=50, pady=50)
@@ -24,6 +29,9 @@ kanye_img = PhotoImage(file="kanye.png")
 kanye_button = Button(image=kanye_img, highlightthickness=0, command=get_quote)
 kanye_button.grid(row=1, column=0)
 
+quote_provider = QuoteProvider(window)
+quote_provider.start()
+window.protocol("WM_DELETE_WINDOW", close_window)
 
 
 window.mainloop()
\ No newline at end of file
@@ -0,0 +1,158 @@
+import json
+import queue
+import random
+import threading
+from collections import deque
+from pathlib import Path
+
+import requests
+
+QUOTE_ENDPOINT = "https://api.kanye.rest"
+CACHE_FILE = Path(__file__).with_name("quote_cache.json")
+# Retry delays in seconds after a failed fetch or a repeated quote
+MIN_BACKOFF = 1
+MAX_BACKOFF = 60
+
+
+class QuoteProvider:
+    """Prefetches Kanye quotes on a background thread so the Tkinter UI never waits on the network"""
+
+    def __init__(self, window, buffer_size=5, cache_path=CACHE_FILE, timeout=(3, 5),
+                 poll_ms=100, max_cached=200):
+        """
+        Create a quote provider bound to a Tk window
+
+        Args:
+            window: Tk root; results are handed back to its event loop via `after`
+            buffer_size: Number of quotes to keep ready ahead of clicks
+            cache_path: JSON file of previously seen quotes, used when offline
+            timeout: (connect, read) timeout for each HTTP request in seconds
+            poll_ms: How often the UI thread collects prefetched quotes
+            max_cached: Maximum number of quotes kept in the on-disk cache
+        """
+        self.window = window
+        self.cache_path = Path(cache_path)
+        self.timeout = timeout
+        self.poll_ms = poll_ms
+        self.max_cached = max_cached
+
+        # Only touched on the Tk thread
+        self._buffer = deque(maxlen=buffer_size)
+        self._recent = deque(maxlen=max(20, buffer_size * 4))
+        self._pending_callback = None
+        self._duplicate_backoff = MIN_BACKOFF
+
+        # Extended and saved by the worker, read by the Tk thread
+        self._cache = self._load_cache()
+        self._cache_lock = threading.Lock()
+
+        # Hand-off between the worker and the Tk thread
+        self._results = queue.Queue()
+        self._slots = threading.Semaphore(buffer_size)
+        self._stop = threading.Event()
+        self._worker = threading.Thread(target=self._prefetch, daemon=True)
+
+    def start(self):
+        """Start prefetching and polling for results"""
+        self._worker.start()
+        self.window.after(self.poll_ms, self._poll)
+
+    def stop(self):
+        """Stop the background worker (the quote cache is saved as quotes arrive)"""
+        self._stop.set()
+        self._slots.release()
+
+    def next_quote(self, callback):
+        """
+        Deliver the next quote to `callback` on the Tk thread
+
+        Uses a prefetched quote when one is ready, otherwise a cached quote if any
+        exist, otherwise waits for the worker to deliver one. A cached quote is never
+        the one currently on screen.
+        """
+        if self._buffer:
+            self._slots.release()
+            self._deliver(callback, self._buffer.popleft())
+            return
+
+        with self._cache_lock:
+            cache = list(self._cache)
+        last_shown = self._recent[-1] if self._recent else None
+        cached = ([quote for quote in cache if quote not in self._recent]
+                  or [quote for quote in cache if quote != last_shown])
+        if cached:
+            self._deliver(callback, random.choice(cached))
+        else:
+            self._pending_callback = callback
+
+    def _deliver(self, callback, quote):
+        self._recent.append(quote)
+        callback(quote)
+
+    def _poll(self):
+        """Move quotes from the worker into the ring buffer (runs on the Tk thread)"""
+        try:
+            while True:
+                quote = self._results.get_nowait()
+                if quote in self._recent or quote in self._buffer:
+                    # The API keeps repeating itself: back off before fetching again
+                    self.window.after(self._duplicate_backoff * 1000, self._slots.release)
+                    self._duplicate_backoff = min(self._duplicate_backoff * 2, MAX_BACKOFF)
+                    continue
+                self._duplicate_backoff = MIN_BACKOFF
+                if self._pending_callback:
+                    callback, self._pending_callback = self._pending_callback, None
+                    self._slots.release()
+                    self._deliver(callback, quote)
+                else:
+                    self._buffer.append(quote)
+        except queue.Empty:
+            pass
+
+        if not self._stop.is_set():
+            self.window.after(self.poll_ms, self._poll)
+
+    def _prefetch(self):
+        """Worker loop: fetch a quote whenever a buffer slot is free"""
+        session = requests.Session()
+        backoff = MIN_BACKOFF
+        while not self._stop.is_set():
+            self._slots.acquire()
+            if self._stop.is_set():
+                break
+            try:
+                response = session.get(QUOTE_ENDPOINT, timeout=self.timeout)
+                response.raise_for_status()
+                quote = response.json()["quote"]
+                backoff = MIN_BACKOFF
+            except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                print(f"Error fetching quote: {e}")
+                self._slots.release()
+                # Offline or rate limited: the UI falls back to cached quotes meanwhile
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+                continue
+
+            self._results.put(quote)
+            self._remember(quote)
+
+    def _remember(self, quote):
+        """Add a new quote to the offline cache and save it (runs on the worker thread)"""
+        with self._cache_lock:
+            if quote in self._cache:
+                return
+            self._cache = (self._cache + [quote])[-self.max_cached:]
+            cache = list(self._cache)
+        self._save_cache(cache)
+
+    def _load_cache(self):
+        try:
+            return json.loads(self.cache_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+
+    def _save_cache(self, cache):
+        try:
+            self.cache_path.write_text(json.dumps(cache))
+        except OSError as e:
+            print(f"Error saving quote cache: {e}")
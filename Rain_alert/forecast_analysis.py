@@ -0,0 +1,153 @@
+import numpy as np
+
+# OWM condition codes below 700 cover thunderstorm, drizzle, rain and snow
+RAIN_THRESHOLD_CODE = 700
+CLEAR_CODE = 800
+
+BLOCK_DTYPE = np.dtype([
+    ("code", np.int16),
+    ("precipitation", np.float32),
+    ("pop", np.float32),
+    ("dt", np.int64),
+])
+
+
+class ForecastArrays:
+    """Forecast blocks for one or many locations packed into (locations, blocks) arrays"""
+
+    def __init__(self, codes, precipitation, pop, timestamps, valid):
+        self.codes = codes
+        self.precipitation = precipitation
+        self.pop = pop
+        self.timestamps = timestamps
+        self.valid = valid
+
+    def __len__(self):
+        return self.codes.shape[0]
+
+
+def _block_fields(block):
+    """(code, precipitation, pop, timestamp) for one forecast block"""
+    return (
+        block["weather"][0]["id"],
+        # Volumes are optional, and OWM omits "3h" when nothing fell in the block
+        block.get("rain", {}).get("3h", 0.0) + block.get("snow", {}).get("3h", 0.0),
+        block.get("pop", 0.0),
+        block["dt"],
+    )
+
+
+def load_forecasts(weather_lists, max_blocks=None):
+    """
+    Pack OWM forecast `list` payloads into NumPy arrays
+
+    Args:
+        weather_lists: One `list` payload per location, as returned by the forecast API
+        max_blocks: Only pack this many leading blocks per location, or None for all of them
+
+    Returns:
+        ForecastArrays: Shorter forecasts are padded with clear, dry, invalid blocks
+    """
+    if max_blocks is not None:
+        weather_lists = [weather_list[:max_blocks] for weather_list in weather_lists]
+
+    n_locations = len(weather_lists)
+    lengths = np.fromiter(map(len, weather_lists), dtype=np.intp, count=n_locations)
+    total = int(lengths.sum())
+    # Keep at least one (invalid) column so reductions work on empty forecasts
+    n_blocks = max(int(lengths.max(initial=0)), 1)
+
+    # Single pass over every block into a flat structured array
+    flat = np.fromiter(
+        (_block_fields(block) for weather_list in weather_lists for block in weather_list),
+        dtype=BLOCK_DTYPE,
+        count=total,
+    )
+
+    # Scatter the flat blocks into padded (locations, blocks) rows
+    rows = np.repeat(np.arange(n_locations), lengths)
+    columns = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+    codes = np.full((n_locations, n_blocks), CLEAR_CODE, dtype=np.int16)
+    precipitation = np.zeros((n_locations, n_blocks), dtype=np.float32)
+    pop = np.zeros((n_locations, n_blocks), dtype=np.float32)
+    timestamps = np.zeros((n_locations, n_blocks), dtype=np.int64)
+    valid = np.zeros((n_locations, n_blocks), dtype=bool)
+
+    codes[rows, columns] = flat["code"]
+    precipitation[rows, columns] = flat["precipitation"]
+    pop[rows, columns] = flat["pop"]
+    timestamps[rows, columns] = flat["dt"]
+    valid[rows, columns] = True
+
+    return ForecastArrays(codes, precipitation, pop, timestamps, valid)
+
+
+def rain_mask(forecasts, horizon=None, threshold_code=RAIN_THRESHOLD_CODE):
+    """Boolean (locations, blocks) mask of rainy blocks within the first `horizon` blocks"""
+    mask = forecasts.valid & (forecasts.codes < threshold_code)
+    if horizon is not None:
+        mask[:, horizon:] = False
+    return mask
+
+
+def rain_windows(forecasts, horizon=None, threshold_code=RAIN_THRESHOLD_CODE):
+    """
+    Summarise rain for every location in a single vectorized pass
+
+    Args:
+        forecasts: ForecastArrays from load_forecasts
+        horizon: Number of leading blocks to consider, or None for the whole forecast
+        threshold_code: Condition codes below this count as rain
+
+    Returns:
+        dict: Per-location arrays `rain_expected`, `start`, `end` (timestamps of the
+        first and last rainy block, 0 when dry), `rainy_blocks`, `max_intensity`
+        and `total_precipitation` (mm per 3 hours / mm) and `max_pop`
+    """
+    mask = rain_mask(forecasts, horizon, threshold_code)
+    rain_expected = mask.any(axis=1)
+    n_blocks = mask.shape[1]
+
+    first = mask.argmax(axis=1)
+    last = n_blocks - 1 - mask[:, ::-1].argmax(axis=1)
+    rows = np.arange(len(forecasts))
+    start = np.where(rain_expected, forecasts.timestamps[rows, first], 0)
+    end = np.where(rain_expected, forecasts.timestamps[rows, last], 0)
+
+    rainy_precipitation = np.where(mask, forecasts.precipitation, 0.0)
+    return {
+        "rain_expected": rain_expected,
+        "start": start,
+        "end": end,
+        "rainy_blocks": mask.sum(axis=1),
+        "max_intensity": rainy_precipitation.max(axis=1, initial=0.0),
+        "total_precipitation": rainy_precipitation.sum(axis=1),
+        "max_pop": np.where(mask, forecasts.pop, 0.0).max(axis=1, initial=0.0),
+    }
+
+
+def subscriber_alerts(forecasts, location_index, min_pop=0.0, min_precipitation=0.0,
+                      horizon=None, threshold_code=RAIN_THRESHOLD_CODE):
+    """
+    Decide which subscribers should be alerted, each with their own thresholds
+
+    Args:
+        forecasts: ForecastArrays from load_forecasts
+        location_index: Row in `forecasts` for each subscriber
+        min_pop: Minimum probability of precipitation, scalar or one per subscriber
+        min_precipitation: Minimum mm per 3-hour block, scalar or one per subscriber
+        horizon: Number of leading blocks to consider, or None for the whole forecast
+        threshold_code: Condition codes below this count as rain
+
+    Returns:
+        numpy.ndarray: Boolean array with one verdict per subscriber
+    """
+    location_index = np.asarray(location_index, dtype=np.intp)
+    min_pop = np.asarray(min_pop, dtype=np.float32).reshape(-1, 1)
+    min_precipitation = np.asarray(min_precipitation, dtype=np.float32).reshape(-1, 1)
+
+    mask = rain_mask(forecasts, horizon, threshold_code)[location_index]
+    mask &= forecasts.pop[location_index] >= min_pop
+    mask &= forecasts.precipitation[location_index] >= min_precipitation
+    return mask.any(axis=1)
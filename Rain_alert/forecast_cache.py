@@ -0,0 +1,91 @@
+import json
+import time
+from pathlib import Path
+
+# OWM publishes the 5-day forecast in 3-hour blocks and refreshes it on the same cadence
+BLOCK_SECONDS = 3 * 60 * 60
+
+CACHE_FILE = Path(__file__).with_name("forecast_cache.json")
+ALERT_STATE_FILE = Path(__file__).with_name("alert_state.json")
+
+
+def location_key(location):
+    return f"{location['lat']:.4f},{location['lon']:.4f}"
+
+
+def next_update(now):
+    """Start of the next 3-hour block, when OWM publishes a fresh forecast"""
+    return (int(now) // BLOCK_SECONDS + 1) * BLOCK_SECONDS
+
+
+def _load_json(path):
+    try:
+        return json.loads(Path(path).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_json(path, data):
+    path = Path(path)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data))
+    tmp_path.replace(path)
+
+
+def get_cached_forecast(location, hours, now=None, path=CACHE_FILE):
+    """
+    Return the next `hours` forecast blocks for a location from the cache
+
+    Blocks that have already ended are dropped. Returns None when the cached
+    forecast has expired or does not cover enough upcoming blocks.
+    """
+    now = time.time() if now is None else now
+    entry = _load_json(path).get(location_key(location))
+    if not entry or now >= entry["expires"]:
+        return None
+
+    upcoming = [
+        block for dt, block in sorted(entry["blocks"].items(), key=lambda item: int(item[0]))
+        if int(dt) + BLOCK_SECONDS > now
+    ]
+    if len(upcoming) < hours:
+        return None
+    return upcoming[:hours]
+
+
+def store_forecast(location, weather_list, now=None, path=CACHE_FILE):
+    """Store forecast blocks for a location, keyed by each block's timestamp"""
+    now = time.time() if now is None else now
+    cache = _load_json(path)
+    cache[location_key(location)] = {
+        "expires": next_update(now),
+        "blocks": {str(block["dt"]): block for block in weather_list},
+    }
+    _save_json(path, cache)
+
+
+def window_key(location, weather_list):
+    """Identify a forecast window by location and the day its first block falls on"""
+    first_day = time.strftime("%Y-%m-%d", time.gmtime(weather_list[0]["dt"]))
+    return f"{location_key(location)}@{first_day}"
+
+
+def verdict_changed(key, rain_expected, path=ALERT_STATE_FILE):
+    """
+    Report whether the rain verdict for a window differs from the last recorded one
+
+    Read-only; call record_verdict once any alert for the new verdict has been sent.
+    """
+    return _load_json(path).get(key) != rain_expected
+
+
+def record_verdict(key, rain_expected, now=None, path=ALERT_STATE_FILE):
+    """Save the rain verdict for a window and drop windows for days that have passed"""
+    now = time.time() if now is None else now
+    today = time.strftime("%Y-%m-%d", time.gmtime(now))
+    state = {
+        window: verdict for window, verdict in _load_json(path).items()
+        if window.rsplit("@", 1)[-1] >= today
+    }
+    state[key] = rain_expected
+    _save_json(path, state)
@@ -1,5 +1,7 @@
 import requests
-from twilio.rest import Client
+from forecast_analysis import RAIN_THRESHOLD_CODE, load_forecasts, rain_windows
+from forecast_cache import get_cached_forecast, store_forecast, window_key, verdict_changed, record_verdict
+from messaging import MessagingGateway, TwilioSmsBackend
 
 OWM_ENDPOINT = "https://api.openweathermap.org/data/2.5/forecast"
 API_KEY = "__YOUR_OWM_API_KEY__"
@@ -11,8 +13,9 @@ LOCATION = {
     "lon": 7.447447,
 }
 
-RAIN_THRESHOLD_CODE = 700
 FORECAST_HOURS = 4
+# The free forecast API returns up to 5 days of 3-hour blocks
+FULL_FORECAST_BLOCKS = 40
 
 def fetch_weather_data(location, hours, api_key):
     params = {
@@ -24,22 +27,46 @@ def fetch_weather_data(location, hours, api_key):
     response.raise_for_status()
     return response.json()["list"]
 
-def is_rain_expected(weather_list):
-    return any(int(hour["weather"][0]["id"]) < RAIN_THRESHOLD_CODE for hour in weather_list)
+def get_forecast(location, hours, api_key):
+    weather_list = get_cached_forecast(location, hours)
+    if weather_list is None:
+        weather_list = fetch_weather_data(location, FULL_FORECAST_BLOCKS, api_key)
+        store_forecast(location, weather_list)
+    return weather_list
 
-def notify_rain_alert(account_sid, auth_token):
-    client = Client(account_sid, auth_token)
-    message = client.messages.create(
-        body="It's going to rain today. Remember to bring an umbrella.",
-        from_="YOUR TWILIO VIRTUAL NUMBER",
-        to="YOUR TWILIO VERIFIED REAL NUMBER"
-    )
+def is_rain_expected(weather_list, hours=FORECAST_HOURS):
+    summary = rain_windows(load_forecasts([weather_list], max_blocks=hours), threshold_code=RAIN_THRESHOLD_CODE)
+    return bool(summary["rain_expected"][0])
+
+def create_gateway(account_sid, auth_token):
+    gateway = MessagingGateway()
+    gateway.register("sms", TwilioSmsBackend(account_sid, auth_token, "YOUR TWILIO VIRTUAL NUMBER"),
+                     rate_per_second=1)
+    return gateway
+
+def notify_rain_alert(gateway):
+    message = gateway.send(
+        "sms",
+        to="YOUR TWILIO VERIFIED REAL NUMBER",
+        body="It's going to rain today. Remember to bring an umbrella."
+    ).result()
     print(f"Message status: {message.status}")
 
 def main():
-    weather_forecast = fetch_weather_data(LOCATION, FORECAST_HOURS, API_KEY)
-    if is_rain_expected(weather_forecast):
-        notify_rain_alert(ACCOUNT_SID, AUTH_TOKEN)
+    weather_forecast = get_forecast(LOCATION, FORECAST_HOURS, API_KEY)
+    if not weather_forecast:
+        # No blocks means no rain, and there is no window to record a verdict for
+        print("Empty forecast, no rain expected")
+        return
+    rain_expected = is_rain_expected(weather_forecast)
+    key = window_key(LOCATION, weather_forecast)
+    # Only text when the verdict for this window flips, not on every run
+    if verdict_changed(key, rain_expected):
+        if rain_expected:
+            with create_gateway(ACCOUNT_SID, AUTH_TOKEN) as gateway:
+                notify_rain_alert(gateway)
+        # Saved only after a successful send so a failed alert is retried next run
+        record_verdict(key, rain_expected)
 
 if __name__ == "__main__":
     main()
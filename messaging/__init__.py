@@ -0,0 +1,17 @@
+"""Shared messaging gateway used by Rain_alert, Birthday_wisher and Flight_tracker"""
+
+from .backends import SmtpEmailBackend, TwilioSmsBackend, TwilioWhatsAppBackend
+from .gateway import DeliveryMetrics, Message, MessagingGateway, RateLimiter
+from .outbox import Outbox, make_key
+
+__all__ = [
+    "DeliveryMetrics",
+    "Message",
+    "MessagingGateway",
+    "Outbox",
+    "RateLimiter",
+    "SmtpEmailBackend",
+    "TwilioSmsBackend",
+    "TwilioWhatsAppBackend",
+    "make_key",
+]
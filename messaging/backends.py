@@ -0,0 +1,167 @@
+import smtplib
+import threading
+from email.message import EmailMessage
+
+# Twilio errors that mean the request was rejected before a message was created
+TWILIO_RETRYABLE_STATUSES = {429, 503}
+
+
+class SmtpEmailBackend:
+    """Sends email over SMTP, keeping one logged-in connection per worker thread"""
+
+    def __init__(self, host, username, password, sender=None, port=None):
+        """
+        Create an SMTP backend
+
+        Args:
+            host: SMTP server address
+            username: Login for the SMTP server
+            password: Password for the SMTP server
+            sender: From address (defaults to username)
+            port: SMTP port (defaults to smtplib's default; STARTTLS is always used)
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender or username
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = smtplib.SMTP(self.host, self.port or 0)
+            connection.starttls()
+            connection.login(self.username, self.password)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _drop_connection(self):
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            with self._lock:
+                if connection in self._connections:
+                    self._connections.remove(connection)
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def send(self, message):
+        """
+        Send an email
+
+        Args:
+            message: Message with `to`, `body` and optional `subject`
+
+        Returns:
+            dict: Recipients refused by the server (empty on full success)
+        """
+        email = EmailMessage()
+        email["Subject"] = message.subject or ""
+        email["From"] = self.sender
+        email["To"] = message.to
+        email.set_content(message.body)
+
+        try:
+            return self._connection().send_message(email)
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPResponseException, OSError):
+            # Start the retry from a fresh connection
+            self._drop_connection()
+            raise
+
+    def is_retryable(self, error):
+        """
+        Whether a failed send is worth retrying
+
+        Dropped or refused connections and 4xx (temporary) SMTP replies are retried.
+        Authentication failures, refused recipients and other 5xx replies are permanent.
+        """
+        if isinstance(error, smtplib.SMTPResponseException):
+            return 400 <= error.smtp_code < 500
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return False
+        return isinstance(error, (smtplib.SMTPServerDisconnected, ConnectionError))
+
+    def close(self):
+        """Close every open SMTP connection"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.quit()
+            except Exception:
+                pass
+
+
+class TwilioSmsBackend:
+    """Sends SMS through a shared Twilio client"""
+
+    def __init__(self, account_sid, auth_token, from_number, client=None):
+        """
+        Create a Twilio SMS backend
+
+        Args:
+            account_sid: Twilio account SID
+            auth_token: Twilio auth token
+            from_number: Twilio virtual number to send from
+            client: Existing Twilio Client to reuse
+        """
+        if client is None:
+            from twilio.rest import Client
+            client = Client(account_sid, auth_token)
+        self.client = client
+        self.from_number = from_number
+
+    def _address(self, number):
+        return number
+
+    def send(self, message):
+        """
+        Send a text message
+
+        Returns:
+            twilio MessageInstance: The created message (has `sid` and `status`)
+        """
+        return self.client.messages.create(
+            from_=self._address(self.from_number),
+            body=message.body,
+            to=self._address(message.to)
+        )
+
+    def is_retryable(self, error):
+        """
+        Whether a failed send is worth retrying
+
+        Only errors where Twilio cannot have created the message are retried:
+        rate limiting, service unavailable and failures to connect. Read timeouts
+        are not retried, since Twilio may already have accepted the message.
+        """
+        from twilio.base.exceptions import TwilioRestException
+        import requests
+        from urllib3.exceptions import NewConnectionError
+
+        if isinstance(error, TwilioRestException):
+            return error.status in TWILIO_RETRYABLE_STATUSES
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(error, requests.exceptions.ConnectionError):
+            # Connection errors are also raised when a connection drops mid-request
+            reason = getattr(error.args[0], "reason", None) if error.args else None
+            return isinstance(reason, NewConnectionError)
+        return False
+
+    def close(self):
+        pass
+
+
+class TwilioWhatsAppBackend(TwilioSmsBackend):
+    """Sends WhatsApp messages through a shared Twilio client"""
+
+    def _address(self, number):
+        return number if number.startswith("whatsapp:") else f"whatsapp:{number}"
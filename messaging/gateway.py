@@ -0,0 +1,223 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class Message:
+    """A single outgoing message for one recipient"""
+
+    def __init__(self, channel, to, body, subject=None):
+        self.channel = channel
+        self.to = to
+        self.body = body
+        self.subject = subject
+
+    def __repr__(self):
+        return f"Message(channel={self.channel!r}, to={self.to!r})"
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` sends per second with bursts of up to `burst`"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a send is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class DeliveryMetrics:
+    """Thread-safe delivery counters for one channel"""
+
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, success, attempts, latency):
+        with self._lock:
+            if success:
+                self.sent += 1
+            else:
+                self.failed += 1
+            self.retries += attempts - 1
+            self.total_latency += latency
+
+    def snapshot(self):
+        with self._lock:
+            delivered = self.sent + self.failed
+            return {
+                "sent": self.sent,
+                "failed": self.failed,
+                "retries": self.retries,
+                "avg_latency": self.total_latency / delivered if delivered else 0.0,
+            }
+
+
+def _is_retryable(backend, error):
+    is_retryable = getattr(backend, "is_retryable", None)
+    if is_retryable is None:
+        return False
+    try:
+        return bool(is_retryable(error))
+    except Exception as e:
+        # A broken classifier must not hide the original error; treat it as permanent
+        print(f"Error classifying {error!r}: {e}")
+        return False
+
+
+class _Channel:
+    def __init__(self, name, backend, concurrency, rate_limiter, max_retries, backoff):
+        self.name = name
+        self.backend = backend
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.queue = queue.Queue()
+        self.metrics = DeliveryMetrics()
+        self.workers = []
+
+
+class MessagingGateway:
+    """
+    Queues outgoing messages and delivers them through pluggable backends
+
+    Each registered channel (e.g. "email", "sms", "whatsapp") has its own queue,
+    worker threads, rate limit, retry policy and delivery metrics.
+    """
+
+    def __init__(self):
+        self._channels = {}
+
+    def register(self, channel, backend, concurrency=1, rate_per_second=None,
+                 max_retries=3, backoff=1.0, rate_limiter=None):
+        """
+        Register a backend for a channel and start its workers
+
+        Args:
+            channel: Channel name used when sending
+            backend: Object with `send(message)` and `close()` methods, and optionally
+                `is_retryable(error)`; errors are never retried without it
+            concurrency: Number of worker threads delivering for this channel
+            rate_per_second: Maximum sends per second, or None for no limit
+            max_retries: Extra attempts after a retryable failure
+            backoff: Base delay in seconds, doubled after each failed attempt
+            rate_limiter: Existing RateLimiter to share with another channel on the same provider
+        """
+        if channel in self._channels:
+            raise ValueError(f"Channel already registered: {channel}")
+        if rate_limiter is None and rate_per_second:
+            rate_limiter = RateLimiter(rate_per_second)
+
+        state = _Channel(channel, backend, concurrency, rate_limiter, max_retries, backoff)
+        for index in range(concurrency):
+            worker = threading.Thread(
+                target=self._work, args=(state,), name=f"messaging-{channel}-{index}", daemon=True
+            )
+            worker.start()
+            state.workers.append(worker)
+        self._channels[channel] = state
+
+    def send(self, channel, to, body, subject=None):
+        """
+        Queue a message for delivery
+
+        Returns:
+            Future: Resolves to the backend's send result, or raises its last error
+        """
+        if channel not in self._channels:
+            raise ValueError(f"No backend registered for channel: {channel}")
+        future = Future()
+        self._channels[channel].queue.put((Message(channel, to, body, subject), future))
+        return future
+
+    def flush(self):
+        """Block until every queued message has been delivered or has failed"""
+        for state in self._channels.values():
+            state.queue.join()
+
+    def is_retryable(self, channel, error):
+        """Whether the backend for `channel` considers `error` temporary (never for unknown channels)"""
+        state = self._channels.get(channel)
+        return state is not None and _is_retryable(state.backend, error)
+
+    def metrics(self):
+        """Delivery metrics per channel"""
+        return {name: state.metrics.snapshot() for name, state in self._channels.items()}
+
+    def close(self):
+        """Deliver everything still queued, stop the workers and close the backends"""
+        self.flush()
+        for state in self._channels.values():
+            for _ in state.workers:
+                state.queue.put(None)
+            for worker in state.workers:
+                worker.join()
+            state.backend.close()
+        self._channels = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _work(self, state):
+        while True:
+            item = state.queue.get()
+            if item is None:
+                state.queue.task_done()
+                return
+            message, future = item
+            try:
+                if future.set_running_or_notify_cancel():
+                    self._deliver(state, message, future)
+            finally:
+                state.queue.task_done()
+
+    def _deliver(self, state, message, future):
+        # Any error here resolves the future, so callers never wait forever and the worker survives
+        started = time.monotonic()
+        attempts = 0
+        try:
+            while True:
+                attempts += 1
+                if state.rate_limiter:
+                    state.rate_limiter.acquire()
+                try:
+                    result = state.backend.send(message)
+                    break
+                except Exception as e:
+                    if attempts > state.max_retries or not _is_retryable(state.backend, e):
+                        raise
+                time.sleep(state.backoff * 2 ** (attempts - 1))
+        except Exception as e:
+            self._record(state, False, attempts, started)
+            future.set_exception(e)
+        else:
+            self._record(state, True, attempts, started)
+            future.set_result(result)
+
+    def _record(self, state, success, attempts, started):
+        try:
+            state.metrics.record(success, attempts, time.monotonic() - started)
+        except Exception as e:
+            print(f"Error recording {state.name} delivery metrics: {e}")
@@ -0,0 +1,269 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    channel TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    subject TEXT,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    run_id TEXT,
+    expires_at REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status, id);
+"""
+
+# Columns added after the first release, for databases created before them
+MIGRATIONS = {
+    "run_id": "ALTER TABLE outbox ADD COLUMN run_id TEXT",
+    "expires_at": "ALTER TABLE outbox ADD COLUMN expires_at REAL",
+}
+
+
+def make_key(*parts):
+    """Build a stable idempotency key from the parts that identify a message"""
+    return hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+class Outbox:
+    """
+    Durable SQLite outbox in front of a MessagingGateway
+
+    Messages are stored before delivery and marked sent once the gateway confirms
+    them, so a crash or restart resumes from the table instead of losing or
+    duplicating messages. Delivery is at-least-once: a message whose send
+    succeeded just before a crash may be sent again on restart.
+
+    Each Outbox instance is one run: rows are tagged with its run id, and
+    messages left over from earlier runs are only delivered through
+    resume_interrupted. Rows past their expiry are never delivered.
+    """
+
+    def __init__(self, path, gateway, batch_size=50, max_attempts=5, interval=5.0,
+                 ttl=None, run_id=None):
+        """
+        Open (or create) an outbox database
+
+        Args:
+            path: SQLite database file
+            gateway: MessagingGateway used to deliver messages
+            batch_size: Messages handed to the gateway per batch
+            max_attempts: Delivery attempts before a message is marked failed
+            interval: Seconds the background drainer waits between passes
+            ttl: Seconds a queued message stays deliverable, or None to never expire
+            run_id: Identifier for this run (a random one by default)
+        """
+        self.path = str(path)
+        self.gateway = gateway
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.interval = interval
+        self.ttl = ttl
+        self.run_id = run_id or uuid.uuid4().hex
+        # Runs whose messages this instance delivers: its own and any it resumed
+        self._runs = [self.run_id]
+
+        self._drain_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._drainer = None
+
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(outbox)")}
+            for column, statement in MIGRATIONS.items():
+                if column not in columns:
+                    connection.execute(statement)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per operation keeps the outbox usable from any thread
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            connection.execute("PRAGMA synchronous=NORMAL")
+            # Commit (or roll back) the transaction, then always close the connection
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def enqueue(self, channel, to, body, subject=None, key=None):
+        """
+        Store a message for delivery unless one with the same key already exists
+
+        Args:
+            channel: Gateway channel to send through
+            to: Recipient address
+            body: Message content
+            subject: Optional subject (email only)
+            key: Idempotency key, derived from the message contents if omitted
+
+        Returns:
+            bool: True if the message was added, False if it was a duplicate
+        """
+        key = key or make_key(channel, to, subject, body)
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO outbox "
+                "(idempotency_key, channel, recipient, subject, body, run_id, expires_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, channel, to, subject, body, self.run_id, expires_at, now, now)
+            )
+            added = cursor.rowcount == 1
+        self._wake.set()
+        return added
+
+    def pending_count(self):
+        """Number of unexpired messages still waiting to be delivered"""
+        self._expire()
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status = 'pending'"
+            ).fetchone()[0]
+
+    def _expire(self):
+        """Mark pending messages past their expiry so they are never delivered"""
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE outbox SET status = 'expired', updated_at = ? "
+                "WHERE status = 'pending' AND expires_at IS NOT NULL AND expires_at <= ?",
+                (now, now)
+            )
+
+    def resume_interrupted(self):
+        """
+        Deliver messages left pending by the most recent earlier run
+
+        Pending messages from any older run are marked expired rather than sent.
+
+        Returns:
+            tuple: (resumed, sent, failed, retrying) counts
+        """
+        self._expire()
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT run_id FROM outbox WHERE status = 'pending' AND run_id IS NOT ? "
+                "ORDER BY id DESC LIMIT 1",
+                (self.run_id,)
+            ).fetchone()
+            if row is None:
+                return 0, 0, 0, 0
+            interrupted_run = row[0]
+            connection.execute(
+                "UPDATE outbox SET status = 'expired', updated_at = ? "
+                "WHERE status = 'pending' AND run_id IS NOT ? AND run_id IS NOT ?",
+                (now, self.run_id, interrupted_run)
+            )
+            resumed = connection.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status = 'pending' AND run_id IS ?",
+                (interrupted_run,)
+            ).fetchone()[0]
+        self._runs.append(interrupted_run)
+        sent, failed, retrying = self.drain()
+        return resumed, sent, failed, retrying
+
+    def drain(self):
+        """
+        Deliver every pending message from this run (and any resumed run) once, in batches
+
+        Returns:
+            tuple: (sent, failed, retrying) counts for this pass; retrying messages
+            failed temporarily and stay pending for a later pass
+        """
+        self._expire()
+        sent = failed = retrying = 0
+        last_id = 0
+        with self._drain_lock:
+            while True:
+                runs = ", ".join("?" * len(self._runs))
+                with self._connect() as connection:
+                    rows = connection.execute(
+                        "SELECT id, channel, recipient, subject, body, attempts FROM outbox "
+                        f"WHERE status = 'pending' AND run_id IN ({runs}) AND id > ? ORDER BY id LIMIT ?",
+                        (*self._runs, last_id, self.batch_size)
+                    ).fetchall()
+                if not rows:
+                    return sent, failed, retrying
+
+                last_id = rows[-1][0]
+                futures = [(row, self._send(row)) for row in rows]
+
+                delivered, errors = [], []
+                for (row_id, channel, recipient, _, _, attempts), future in futures:
+                    try:
+                        future.result()
+                        delivered.append(row_id)
+                    except Exception as e:
+                        print(f"Failed to deliver {channel} message to {recipient}: {e}")
+                        # Permanent errors fail at once; temporary ones are retried on later passes
+                        retryable = self.gateway.is_retryable(channel, e)
+                        status = "pending" if retryable and attempts + 1 < self.max_attempts else "failed"
+                        errors.append((status, str(e), row_id))
+
+                now = time.time()
+                with self._connect() as connection:
+                    connection.executemany(
+                        "UPDATE outbox SET status = 'sent', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                        [(now, row_id) for row_id in delivered]
+                    )
+                    connection.executemany(
+                        "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = ?, updated_at = ? "
+                        "WHERE id = ?",
+                        [(status, error, now, row_id) for status, error, row_id in errors]
+                    )
+                sent += len(delivered)
+                retrying += sum(status == "pending" for status, _, _ in errors)
+                failed += sum(status == "failed" for status, _, _ in errors)
+
+    def _send(self, row):
+        """Hand a row to the gateway; errors such as an unregistered channel resolve the future"""
+        _, channel, recipient, subject, body, _ = row
+        try:
+            return self.gateway.send(channel, to=recipient, body=body, subject=subject)
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+            return future
+
+    def start(self):
+        """Start a background thread that drains the outbox as messages arrive"""
+        if self._drainer is None:
+            self._stop.clear()
+            self._drainer = threading.Thread(target=self._run, name="outbox-drainer", daemon=True)
+            self._drainer.start()
+
+    def stop(self):
+        """Stop the background drainer after a final pass over pending messages"""
+        if self._drainer is not None:
+            self._stop.set()
+            self._wake.set()
+            self._drainer.join()
+            self._drainer = None
+        return self.drain()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except Exception as e:
+                # Keep draining on later passes rather than letting the thread die
+                print(f"Outbox drain error: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()